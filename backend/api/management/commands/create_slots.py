@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
-from api.models import ParkingLocation, ParkingSlot
+from django.db import transaction
+from api.models import ParkingLocation, ParkingSlot, Reservation, SLOT_BATCH_SIZE, slot_numbers
 
 class Command(BaseCommand):
     help = 'Creates parking slots for a location'
@@ -18,20 +19,21 @@ class Command(BaseCommand):
             self.stdout.write(self.style.ERROR(f'Location with ID {location_id} does not exist'))
             return
 
-        ParkingSlot.objects.filter(location=location).delete()
-
-        slots = []
-        for i in range(1, total_slots + 1):
-            slot = ParkingSlot(
-                location=location,
-                slot_number=f'A{i:03d}', 
-                is_occupied=False,
-                is_reserved=False
+        with transaction.atomic():
+            existing_slots = ParkingSlot.objects.filter(location=location)
+            if Reservation.objects.filter(parking_slot__location=location).exists():
+                # reservations must be removed through the cascade collector
+                existing_slots.delete()
+            else:
+                # nothing depends on these rows: issue a single DELETE
+                existing_slots._raw_delete(existing_slots.db)
+
+            slots = (
+                ParkingSlot(location=location, slot_number=number)
+                for number in slot_numbers(1, total_slots, prefix='A')
             )
-            slots.append(slot)
-
-        ParkingSlot.objects.bulk_create(slots)
+            ParkingSlot.objects.bulk_create(slots, batch_size=SLOT_BATCH_SIZE)
 
         self.stdout.write(
             self.style.SUCCESS(f'Successfully created {total_slots} slots for location {location.name}')
-        ) 
\ No newline at end of file
+        ) 
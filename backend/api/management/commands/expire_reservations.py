@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from api.models import Reservation, RESERVATION_EXPIRY_DELTA
+
+class Command(BaseCommand):
+    help = 'Marks PENDING reservations older than the expiry window as EXPIRED'
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - RESERVATION_EXPIRY_DELTA
+
+        # single UPDATE statement instead of per-row save()
+        expired = Reservation.objects.filter(
+            status=Reservation.Status.PENDING,
+            created_at__lt=cutoff
+        ).update(status=Reservation.Status.EXPIRED, updated_at=timezone.now())
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Expired {expired} pending reservations')
+        )
@@ -0,0 +1,32 @@
+# Generated by Django 5.0.2 on 2026-10-15 06:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0002_reservation_vehicle_plate"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(
+                fields=["parking_slot", "status", "start_time", "end_time"],
+                name="resv_slot_status_times_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(
+                fields=["user", "status"], name="api_reserva_user_id_4e81af_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(
+                fields=["status", "end_time"], name="api_reserva_status_77809f_idx"
+            ),
+        ),
+    ]
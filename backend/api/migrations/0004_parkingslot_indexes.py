@@ -0,0 +1,27 @@
+# Generated by Django 5.0.2 on 2026-10-15 06:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0003_reservation_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="parkingslot",
+            index=models.Index(
+                fields=["location", "is_occupied"],
+                name="api_parking_locatio_207f7c_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="parkingslot",
+            index=models.Index(
+                fields=["location", "is_reserved"],
+                name="api_parking_locatio_b5713f_idx",
+            ),
+        ),
+    ]
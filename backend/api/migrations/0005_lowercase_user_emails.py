@@ -0,0 +1,35 @@
+from collections import defaultdict
+
+from django.db import migrations
+from django.db.models.functions import Lower
+
+
+def lowercase_emails(apps, schema_editor):
+    User = apps.get_model("api", "User")
+    by_lower = defaultdict(list)
+    for email in User.objects.values_list("email", flat=True):
+        by_lower[email.lower()].append(email)
+    conflicts = sorted(
+        ", ".join(sorted(emails)) for emails in by_lower.values() if len(emails) > 1
+    )
+    if conflicts:
+        # logins are matched case-insensitively from here on, so these accounts
+        # would be unreachable; an operator has to merge or rename them first
+        raise RuntimeError(
+            "Cannot lowercase user emails, these addresses differ only by case: "
+            + "; ".join(conflicts)
+        )
+    for user in User.objects.exclude(email=Lower("email")):
+        user.email = user.email.lower()
+        user.save(update_fields=["email"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0004_parkingslot_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(lowercase_emails, migrations.RunPython.noop),
+    ]
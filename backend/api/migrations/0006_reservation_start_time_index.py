@@ -0,0 +1,19 @@
+# Generated by Django 5.0.2 on 2026-10-15 06:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0005_lowercase_user_emails"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(
+                fields=["start_time"], name="api_reserva_start_t_c4841f_idx"
+            ),
+        ),
+    ]
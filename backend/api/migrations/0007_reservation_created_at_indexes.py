@@ -0,0 +1,25 @@
+# Generated by Django 5.0.2 on 2026-10-15 06:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0006_reservation_start_time_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(
+                fields=["created_at"], name="api_reserva_created_ee6474_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(
+                fields=["user", "created_at"], name="api_reserva_user_id_59c7f7_idx"
+            ),
+        ),
+    ]
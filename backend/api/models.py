@@ -1,11 +1,29 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Coalesce, Now
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import MinValueValidator
 from django.utils import timezone
 from datetime import timedelta
 from django.conf import settings
 
+# rows per INSERT when bulk-creating slots; Django further caps this to the backend's parameter limit
+SLOT_BATCH_SIZE = 1000
+
+# notification types delivered to users with the IMPORTANT preference
+IMPORTANT_NOTIFICATION_TYPES = frozenset({'reservation_cancellation', 'reservation_expiry'})
+
+# reservation time windows, built once from settings
+RESERVATION_EXPIRY_DELTA = timedelta(minutes=settings.RESERVATION_EXPIRY_MINUTES)
+RESERVATION_CANCELLATION_DELTA = timedelta(hours=settings.RESERVATION_CANCELLATION_WINDOW_HOURS)
+
+
+def slot_numbers(first, last, prefix=''):
+    """
+    Return zero-padded slot numbers from first to last inclusive, e.g. '001'.
+    """
+    return [prefix + str(i).zfill(3) for i in range(first, last + 1)]
+
 
 class UserManager(BaseUserManager):
     """
@@ -15,6 +33,19 @@ class UserManager(BaseUserManager):
 
     use_in_migrations = True
 
+    @classmethod
+    def normalize_email(cls, email):
+        """
+        Lowercase the whole address so the unique email index is case-insensitive.
+        """
+        return super().normalize_email(email).lower()
+
+    def get_by_natural_key(self, username):
+        """
+        Look up a user by email using an exact match on the normalized address.
+        """
+        return self.get(**{self.model.USERNAME_FIELD: self.normalize_email(username)})
+
     def _create_user(self, email, password, **extra_fields):
         """
         Create and save a User with the given email and password.
@@ -97,12 +128,47 @@ class User(AbstractUser):
         """
         Check if user should receive a specific type of notification.
         """
-        if self.notification_preference == self.NotificationPreference.NONE:
+        preference = self.notification_preference
+        if preference == self.NotificationPreference.NONE:
             return False
-        if self.notification_preference == self.NotificationPreference.IMPORTANT:
-            return notification_type in ['reservation_cancellation', 'reservation_expiry']
+        if preference == self.NotificationPreference.IMPORTANT:
+            return notification_type in IMPORTANT_NOTIFICATION_TYPES
         return True
 
+class ParkingLocationQuerySet(models.QuerySet):
+    """
+    Custom queryset for ParkingLocation.
+    Provides availability annotations computed in a single query.
+    """
+
+    def with_available_slots(self):
+        """
+        Annotate each location with available_slot_count.
+        A slot is unavailable if it is occupied or has an active confirmed reservation.
+        """
+        now = Now()
+        slots = ParkingSlot.objects.filter(location=models.OuterRef('pk')).order_by()
+        in_use = Reservation.objects.filter(
+            parking_slot=models.OuterRef('pk'),
+            status='CONFIRMED',
+            start_time__lte=now,
+            end_time__gte=now
+        )
+        unavailable = slots.filter(models.Q(is_occupied=True) | models.Exists(in_use))
+
+        def count(queryset):
+            # correlated per-location count, no join fan-out to de-duplicate
+            return Coalesce(models.Subquery(
+                queryset.values('location').annotate(count=models.Count('pk')).values('count')
+            ), 0)
+
+        return self.annotate(
+            available_slot_count=models.ExpressionWrapper(
+                count(slots) - count(unavailable),
+                output_field=models.IntegerField()
+            )
+        )
+
 class ParkingLocation(models.Model):
     """
     Model representing a parking location with multiple parking slots.
@@ -116,6 +182,8 @@ class ParkingLocation(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ParkingLocationQuerySet.as_manager()
+
     def __str__(self):
         return self.name
 
@@ -130,39 +198,82 @@ class ParkingLocation(models.Model):
         Automatically creates or removes parking slots based on total_slots changes.
         """
         is_new = self.pk is None
-        super().save(*args, **kwargs)
-        
-        if is_new:
-            slots = []
-            for i in range(1, self.total_slots + 1):
-                slot = ParkingSlot(
-                    location=self,
-                    slot_number=f'{i:03d}',
-                    is_occupied=False,
-                    is_reserved=False
+        resized = not is_new and 'total_slots' in kwargs.get('update_fields', [])
+        with transaction.atomic():
+            if resized:
+                previous_total = ParkingLocation.objects.filter(
+                    pk=self.pk
+                ).values_list('total_slots', flat=True).get()
+            super().save(*args, **kwargs)
+
+            if is_new:
+                slots = (
+                    ParkingSlot(location=self, slot_number=number)
+                    for number in slot_numbers(1, self.total_slots)
                 )
-                slots.append(slot)
-            ParkingSlot.objects.bulk_create(slots)
-        elif 'total_slots' in kwargs.get('update_fields', []):
-            current_slots = self.parkingslot_set.count()
-            if self.total_slots > current_slots:
-                new_slots = []
-                for i in range(current_slots + 1, self.total_slots + 1):
-                    slot = ParkingSlot(
-                        location=self,
-                        slot_number=f'{i:03d}',
-                        is_occupied=False,
-                        is_reserved=False
-                    )
-                    new_slots.append(slot)
-                ParkingSlot.objects.bulk_create(new_slots)
-            elif self.total_slots < current_slots:
+                ParkingSlot.objects.bulk_create(slots, batch_size=SLOT_BATCH_SIZE)
+            elif resized and self.total_slots > previous_total:
+                # only numbers above the old total, so slots an admin deleted
+                # stay deleted; existing numbers are skipped by the unique constraint
+                new_slots = (
+                    ParkingSlot(location=self, slot_number=number)
+                    for number in slot_numbers(previous_total + 1, self.total_slots)
+                )
+                ParkingSlot.objects.bulk_create(
+                    new_slots, batch_size=SLOT_BATCH_SIZE, ignore_conflicts=True
+                )
+            elif resized and self.total_slots < previous_total:
+                # remove free generated slots beyond the new total; match the exact
+                # numbers so custom ones like 'A001' or 'B1' are left alone
                 self.parkingslot_set.filter(
                     is_occupied=False,
                     is_reserved=False,
-                    slot_number__gt=f'{self.total_slots:03d}'
+                    slot_number__in=slot_numbers(self.total_slots + 1, previous_total)
                 ).delete()
 
+class ParkingSlotQuerySet(models.QuerySet):
+    """
+    Custom queryset for ParkingSlot.
+    Provides eager loading of reservation data for the slot serializers and
+    bulk recomputation of the reservation-driven slot flags.
+    """
+
+    def refresh_reservation_flags(self):
+        """
+        Recompute is_reserved and is_occupied of the selected slots.
+        A slot is reserved and occupied while a CONFIRMED reservation is in progress.
+        """
+        now = timezone.now()
+        in_progress = Reservation.objects.filter(
+            parking_slot=models.OuterRef('pk'),
+            status=Reservation.Status.CONFIRMED,
+            start_time__lte=now,
+            end_time__gte=now
+        )
+        return self.update(
+            is_reserved=models.Exists(in_progress),
+            is_occupied=models.Exists(in_progress),
+            updated_at=now
+        )
+
+    def with_active_reservations(self):
+        """
+        Prefetch upcoming PENDING or CONFIRMED reservations into active_reservations,
+        ordered by start time.
+        """
+        return self.prefetch_related(
+            models.Prefetch(
+                'reservation_set',
+                queryset=Reservation.objects.filter(
+                    end_time__gte=Now(),
+                    status__in=[Reservation.Status.PENDING, Reservation.Status.CONFIRMED]
+                ).only(
+                    'id', 'parking_slot', 'user', 'status', 'start_time', 'end_time'
+                ).order_by('start_time'),
+                to_attr='active_reservations'
+            )
+        )
+
 class ParkingSlot(models.Model):
     """
     Model representing an individual parking slot within a location.
@@ -176,12 +287,50 @@ class ParkingSlot(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ParkingSlotQuerySet.as_manager()
+
     class Meta:
         unique_together = ('location', 'slot_number')
+        indexes = [
+            models.Index(fields=['location', 'is_occupied']),
+            models.Index(fields=['location', 'is_reserved']),
+        ]
 
     def __str__(self):
         return f"{self.location.name} - Slot {self.slot_number}"
 
+class ReservationQuerySet(models.QuerySet):
+    """
+    Custom queryset for Reservation.
+    Provides status annotations evaluated in the database.
+    """
+
+    @staticmethod
+    def _cancellable_q():
+        # mirrors Reservation.can_be_cancelled, evaluated against the database clock
+        return models.Q(
+            status__in=[Reservation.Status.PENDING, Reservation.Status.CONFIRMED],
+            start_time__gt=Now() + models.Value(RESERVATION_CANCELLATION_DELTA)
+        )
+
+    def cancellable(self):
+        """
+        Filter to reservations that can still be cancelled.
+        """
+        return self.filter(self._cancellable_q())
+
+    def with_can_be_cancelled(self):
+        """
+        Annotate each reservation with can_cancel, matching can_be_cancelled.
+        """
+        return self.annotate(
+            can_cancel=models.Case(
+                models.When(self._cancellable_q(), then=models.Value(True)),
+                default=models.Value(False),
+                output_field=models.BooleanField()
+            )
+        )
+
 class Reservation(models.Model):
     """
     Model representing a parking reservation.
@@ -208,23 +357,40 @@ class Reservation(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ReservationQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # overlap check on create and the in-progress EXISTS lookups;
+            # its leading parking_slot also serves the active-reservation prefetch
+            models.Index(
+                fields=['parking_slot', 'status', 'start_time', 'end_time'],
+                name='resv_slot_status_times_idx'
+            ),
+            models.Index(fields=['user', 'status']),
+            models.Index(fields=['status', 'end_time']),
+            # dashboard counts reservations starting today
+            models.Index(fields=['start_time']),
+            # reservation listings page by creation time
+            models.Index(fields=['created_at']),
+            models.Index(fields=['user', 'created_at']),
+        ]
+
     def __str__(self):
         return f"Reservation {self.id} - {self.user.email}"
 
     def save(self, *args, **kwargs):
         """
         Handle reservation status updates.
-        Automatically updates status based on time and expiry rules.
+        Automatically completes confirmed reservations that have ended.
+        Expiry of stale PENDING reservations is handled in bulk by the
+        expire_reservations management command.
         """
         is_new = self._state.adding
         if is_new:
             self.created_at = timezone.now()
             
-        if self.status == self.Status.PENDING:
-            expiry_time = self.created_at + timedelta(minutes=settings.RESERVATION_EXPIRY_MINUTES)
-            if timezone.now() > expiry_time:
-                self.status = self.Status.EXPIRED
-        elif self.status == self.Status.CONFIRMED and 'status' in kwargs.get('update_fields', []):  
+        if self.status == self.Status.CONFIRMED and 'status' in kwargs.get('update_fields', []):  
             if timezone.now() > self.end_time:
                 self.status = self.Status.COMPLETED
         super().save(*args, **kwargs)
@@ -236,5 +402,5 @@ class Reservation(models.Model):
         """
         if self.status not in [self.Status.PENDING, self.Status.CONFIRMED]:
             return False
-        cancellation_deadline = self.start_time - timedelta(hours=settings.RESERVATION_CANCELLATION_WINDOW_HOURS)
+        cancellation_deadline = self.start_time - RESERVATION_CANCELLATION_DELTA
         return timezone.now() < cancellation_deadline 
\ No newline at end of file
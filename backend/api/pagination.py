@@ -1,4 +1,4 @@
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.response import Response
 
 class CustomPagination(PageNumberPagination):
@@ -14,4 +14,14 @@ class CustomPagination(PageNumberPagination):
             'next': self.get_next_link(),
             'previous': self.get_previous_link(),
             'results': data
-        }) 
\ No newline at end of file
+        })
+
+class ReservationCursorPagination(CursorPagination):
+    """
+    Keyset pagination for reservation listings.
+    Each page costs the same regardless of how deep the client pages.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = '-created_at'
@@ -1,13 +1,36 @@
+import copy
+import threading
+
 from rest_framework import serializers
+from rest_framework.validators import UniqueTogetherValidator
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from django.utils import timezone
-from django.db import models
-from .models import ParkingLocation, ParkingSlot, Reservation
+from django.db import transaction
+from .models import ParkingLocation, ParkingSlot, Reservation, SLOT_BATCH_SIZE
 
 User = get_user_model()
 
-class UserSerializer(serializers.ModelSerializer):
+class CachedFieldsSerializerMixin:
+    """
+    Build a ModelSerializer's fields once per serializer class.
+    Each instance gets its own unbound copies, so binding and context stay per instance.
+    """
+
+    _fields_lock = threading.Lock()
+
+    def get_fields(self):
+        cls = type(self)
+        cached = cls.__dict__.get('_cached_fields')
+        if cached is None:
+            with self._fields_lock:
+                cached = cls.__dict__.get('_cached_fields')
+                if cached is None:
+                    cached = super().get_fields()
+                    cls._cached_fields = cached
+        return copy.deepcopy(cached)
+
+class UserSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Base serializer for User model.
     Used for listing and retrieving user information.
@@ -19,7 +42,7 @@ class UserSerializer(serializers.ModelSerializer):
                  'notification_preference', 'created_at')
         read_only_fields = ('id', 'role', 'created_at')
 
-class UserCreateSerializer(serializers.ModelSerializer):
+class UserCreateSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for user registration.
     Handles password validation and confirmation.
@@ -33,6 +56,13 @@ class UserCreateSerializer(serializers.ModelSerializer):
         fields = ('email', 'password', 'password2', 'first_name', 'last_name', 
                  'notification_preference')
 
+    def validate_email(self, value):
+        """Normalize the email and reject addresses differing only by case."""
+        email = User.objects.normalize_email(value)
+        if email != value and User.objects.filter(email=email).exists():
+            raise serializers.ValidationError("user with this email address already exists.")
+        return email
+
     def validate(self, attrs):
         """Validate that passwords match."""
         if attrs['password'] != attrs['password2']:
@@ -45,7 +75,7 @@ class UserCreateSerializer(serializers.ModelSerializer):
         user = User.objects.create_user(**validated_data)
         return user
 
-class UserUpdateSerializer(serializers.ModelSerializer):
+class UserUpdateSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for updating user profile information.
     Excludes sensitive fields like password and role.
@@ -71,13 +101,14 @@ class ChangePasswordSerializer(serializers.Serializer):
         return attrs
 
 
-class ParkingLocationSerializer(serializers.ModelSerializer):
+class ParkingLocationSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Base serializer for ParkingLocation model.
     Includes computed available_slots field based on actual reservation status.
+    Expects a queryset annotated with ParkingLocation.objects.with_available_slots().
     """
     
-    available_slots = serializers.SerializerMethodField()
+    available_slots = serializers.IntegerField(source='available_slot_count', read_only=True)
     
     class Meta:
         model = ParkingLocation
@@ -85,26 +116,7 @@ class ParkingLocationSerializer(serializers.ModelSerializer):
                  'is_active', 'created_at', 'updated_at')
         read_only_fields = ('id', 'created_at', 'updated_at')
 
-    def get_available_slots(self, obj):
-        """
-        Calculate available slots based on actual reservation status.
-        """
-        now = timezone.now()
-        total_slots = obj.parkingslot_set.count()
-        
-        # count slots that are either occupied or have active confirmed reservations
-        unavailable_slots = obj.parkingslot_set.filter(
-            models.Q(is_occupied=True) |
-            models.Q(
-                reservation__status='CONFIRMED',
-                reservation__start_time__lte=now,
-                reservation__end_time__gte=now
-            )
-        ).distinct().count()
-        
-        return total_slots - unavailable_slots
-
-class ParkingLocationCreateSerializer(serializers.ModelSerializer):
+class ParkingLocationCreateSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for creating new parking locations (Admin only).
     """
@@ -114,14 +126,48 @@ class ParkingLocationCreateSerializer(serializers.ModelSerializer):
         fields = ('name', 'address', 'total_slots', 'is_active')
 
 
-class ParkingSlotSerializer(serializers.ModelSerializer):
+class CurrentReservationField(serializers.Field):
+    """
+    Read-only representation of a slot's current reservation (PENDING or CONFIRMED).
+    Reads the prefetched active_reservations list and returns status,
+    start_time, end_time, and user id.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, slot):
+        active_reservations = getattr(slot, 'active_reservations', None)
+        if active_reservations is None:
+            # not prefetched, e.g. a freshly saved instance
+            reservation = Reservation.objects.filter(
+                parking_slot=slot,
+                end_time__gte=timezone.now(),
+                status__in=['PENDING', 'CONFIRMED']
+            ).order_by('start_time').first()
+        else:
+            reservation = active_reservations[0] if active_reservations else None
+        if reservation is None:
+            return None
+        return {
+            'id': reservation.id,
+            'status': reservation.status,
+            'start_time': reservation.start_time,
+            'end_time': reservation.end_time,
+            'user': reservation.user_id
+        }
+
+class ParkingSlotSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Base serializer for ParkingSlot model.
     Includes location name and current reservation information.
+    Querysets should use ParkingSlot.objects.with_active_reservations().
     """
     
     location_name = serializers.CharField(source='location.name', read_only=True)
-    current_reservation = serializers.SerializerMethodField()
+    current_reservation = CurrentReservationField()
     
     class Meta:
         model = ParkingSlot
@@ -129,61 +175,80 @@ class ParkingSlotSerializer(serializers.ModelSerializer):
                  'is_occupied', 'is_reserved', 'current_reservation', 'created_at', 'updated_at')
         read_only_fields = ('id', 'created_at', 'updated_at')
 
-    def get_current_reservation(self, obj):
-        """
-        Get the current reservation for this slot (PENDING or CONFIRMED).
-        Returns status, start_time, end_time, and user id.
-        """
-        now = timezone.now()
-        reservation = Reservation.objects.filter(
-            parking_slot=obj,
-            end_time__gte=now,
-            status__in=['PENDING', 'CONFIRMED']
-        ).order_by('start_time').first()
-        if reservation:
-            return {
-                'id': reservation.id,
-                'status': reservation.status,
-                'start_time': reservation.start_time,
-                'end_time': reservation.end_time,
-                'user': reservation.user.id
-            }
-        return None
-
-class ParkingSlotCreateSerializer(serializers.ModelSerializer):
+class ParkingSlotListSerializer(serializers.Serializer):
+    """
+    Lightweight read-only serializer for slot listings.
+    Reads plain dicts from a values() queryset instead of model instances.
+    """
+
+    id = serializers.IntegerField(read_only=True)
+    location = serializers.IntegerField(source='location_id', read_only=True)
+    location_name = serializers.CharField(source='location__name', read_only=True)
+    slot_number = serializers.CharField(read_only=True)
+    is_occupied = serializers.BooleanField(read_only=True)
+    is_reserved = serializers.BooleanField(read_only=True)
+
+class ParkingSlotBulkCreateSerializer(serializers.ListSerializer):
+    """
+    List serializer for creating a batch of parking slots in one INSERT.
+    An empty batch is rejected.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('allow_empty', False)
+        super().__init__(*args, **kwargs)
+
+    def validate(self, attrs):
+        # the per-item validator only sees existing rows, not the rest of the batch
+        seen = set()
+        for item in attrs:
+            key = (item['location'].pk, item['slot_number'])
+            if key in seen:
+                raise serializers.ValidationError(
+                    f"Slot number {item['slot_number']} appears more than once for this location."
+                )
+            seen.add(key)
+        return attrs
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            return ParkingSlot.objects.bulk_create(
+                [ParkingSlot(**item) for item in validated_data],
+                batch_size=SLOT_BATCH_SIZE
+            )
+
+class ParkingSlotCreateSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for creating new parking slots.
-    Validates slot number uniqueness within location.
+    Slot number uniqueness within location is enforced by the model's
+    unique_together constraint. A list payload is created in bulk.
     """
     
     class Meta:
         model = ParkingSlot
         fields = ('location', 'slot_number')
-
-    def validate(self, attrs):
-        """
-        Validate slot number uniqueness within location.
-        """
-        location = attrs['location']
-        slot_number = attrs['slot_number']
-        
-        if ParkingSlot.objects.filter(location=location, slot_number=slot_number).exists():
-            raise serializers.ValidationError(
-                {"slot_number": "This slot number already exists for this location."}
+        list_serializer_class = ParkingSlotBulkCreateSerializer
+        validators = [
+            UniqueTogetherValidator(
+                queryset=ParkingSlot.objects.all(),
+                fields=('location', 'slot_number'),
+                message="This slot number already exists for this location."
             )
-        return attrs
+        ]
 
 
-class ReservationSerializer(serializers.ModelSerializer):
+class ReservationSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Base serializer for Reservation model.
     Includes computed fields and related model information.
+    Querysets should use select_related('user', 'parking_slot__location')
+    and Reservation.objects.with_can_be_cancelled().
     """
     
     user_email = serializers.EmailField(source='user.email', read_only=True)
     location_name = serializers.CharField(source='parking_slot.location.name', read_only=True)
     slot_number = serializers.CharField(source='parking_slot.slot_number', read_only=True)
-    can_be_cancelled = serializers.BooleanField(read_only=True)
+    can_be_cancelled = serializers.BooleanField(source='can_cancel', read_only=True)
     
     class Meta:
         model = Reservation
@@ -192,6 +257,33 @@ class ReservationSerializer(serializers.ModelSerializer):
                  'can_be_cancelled', 'created_at', 'updated_at')
         read_only_fields = ('id', 'user', 'created_at', 'updated_at')
 
+    def to_representation(self, instance):
+        """
+        Build the output dict directly from the selected related objects,
+        skipping the per-field dotted-source lookups.
+        """
+        datetime_field = self.fields['start_time']
+        slot = instance.parking_slot
+        can_cancel = getattr(instance, 'can_cancel', None)
+        if can_cancel is None:
+            # not annotated with with_can_be_cancelled()
+            can_cancel = instance.can_be_cancelled
+        return {
+            'id': instance.id,
+            'user': instance.user_id,
+            'user_email': instance.user.email,
+            'parking_slot': instance.parking_slot_id,
+            'location_name': slot.location.name,
+            'slot_number': slot.slot_number,
+            'start_time': datetime_field.to_representation(instance.start_time),
+            'end_time': datetime_field.to_representation(instance.end_time),
+            'vehicle_plate': instance.vehicle_plate,
+            'status': instance.status,
+            'can_be_cancelled': can_cancel,
+            'created_at': datetime_field.to_representation(instance.created_at),
+            'updated_at': datetime_field.to_representation(instance.updated_at),
+        }
+
     def validate_status(self, value):
         """
         Validate status changes.
@@ -204,7 +296,7 @@ class ReservationSerializer(serializers.ModelSerializer):
             )
         return value
 
-class ReservationCreateSerializer(serializers.ModelSerializer):
+class ReservationCreateSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for creating new reservations.
     Handles validation of time slots and availability.
@@ -217,68 +309,71 @@ class ReservationCreateSerializer(serializers.ModelSerializer):
     def validate(self, attrs):
         """
         Validate reservation creation parameters.
-        Checks time validity, slot availability, and conflicts.
+        Checks time validity and slot occupancy; conflicts are checked under lock in create().
         """
-        try:
-            start_time = attrs['start_time']
-            end_time = attrs['end_time']
-            parking_slot = attrs['parking_slot']
-            
-            # validate time range
-            if start_time >= end_time:
-                raise serializers.ValidationError(
-                    {"end_time": "End time must be after start time."}
-                )
-            
-            # validate that start time is in the future
-            if start_time <= timezone.now():
-                raise serializers.ValidationError(
-                    {"start_time": "Start time must be in the future."}
-                )
-            
-            # check if slot exists and is available
-            try:
-                slot = ParkingSlot.objects.get(id=parking_slot.id)
-                if slot.is_occupied:
-                    raise serializers.ValidationError(
-                        {"parking_slot": "This slot is currently occupied."}
-                    )
-            except ParkingSlot.DoesNotExist:
+        start_time = attrs['start_time']
+        end_time = attrs['end_time']
+        
+        # validate time range
+        if start_time >= end_time:
+            raise serializers.ValidationError(
+                {"end_time": "End time must be after start time."}
+            )
+        
+        # validate that start time is in the future
+        if start_time <= timezone.now():
+            raise serializers.ValidationError(
+                {"start_time": "Start time must be in the future."}
+            )
+        
+        # parking_slot was already fetched by the related field
+        if attrs['parking_slot'].is_occupied:
+            raise serializers.ValidationError(
+                {"parking_slot": "This slot is currently occupied."}
+            )
+        
+        return attrs
+
+    def create(self, validated_data):
+        """
+        Create a new reservation and update slot status.
+        Locks the slot row so concurrent requests cannot double-book it.
+        """
+        parking_slot = validated_data['parking_slot']
+        start_time = validated_data['start_time']
+        end_time = validated_data['end_time']
+
+        with transaction.atomic():
+            # flag the slot first: the UPDATE takes the row lock and only
+            # matches if the slot still exists and is not occupied
+            locked = ParkingSlot.objects.filter(
+                pk=parking_slot.pk, is_occupied=False
+            ).update(is_reserved=True, updated_at=timezone.now())
+            if not locked:
+                # the slot existed when the field was validated, so it has
+                # been occupied since
                 raise serializers.ValidationError(
-                    {"parking_slot": "Invalid parking slot."}
+                    {"parking_slot": ["This slot is currently occupied."]}
                 )
-            
+
             # check for conflicting CONFIRMED reservations
             if Reservation.objects.filter(
-                parking_slot=parking_slot,
+                parking_slot_id=parking_slot.pk,
                 status='CONFIRMED',
                 start_time__lt=end_time,
                 end_time__gt=start_time
             ).exists():
                 raise serializers.ValidationError(
-                    {"parking_slot": "This slot is already reserved for the selected time period."}
+                    {"parking_slot": ["This slot is already reserved for the selected time period."]}
                 )
-            
-            return attrs
-        except Exception as e:
-            raise serializers.ValidationError(str(e))
 
-    def create(self, validated_data):
-        """
-        Create a new reservation and update slot status.
-        """
-        parking_slot = validated_data['parking_slot']
-        
-        reservation = Reservation.objects.create(
-            **validated_data
-        )
-        
-        parking_slot.is_reserved = True
-        parking_slot.save()
-        
+            reservation = Reservation.objects.create(
+                **validated_data
+            )
+
         return reservation
 
-class ReservationUpdateSerializer(serializers.ModelSerializer):
+class ReservationUpdateSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for updating reservation status (Admin only).
     """
@@ -296,39 +391,8 @@ class ReservationUpdateSerializer(serializers.ModelSerializer):
         return value
 
     def update(self, instance, validated_data):
-        old_status = instance.status
-        new_status = validated_data.get('status', instance.status)
-        instance.status = new_status
-        instance.save()
-
-        slot = instance.parking_slot
-        now = timezone.now()
-        confirmed_res = Reservation.objects.filter(
-            parking_slot=slot,
-            status='CONFIRMED',
-            end_time__gte=now
-        ).order_by('start_time').first()
-        if confirmed_res:
-            if now < confirmed_res.start_time:
-                slot.is_reserved = False
-                slot.is_occupied = False
-            elif confirmed_res.start_time <= now <= confirmed_res.end_time:
-                slot.is_reserved = True
-                slot.is_occupied = True
-            else:
-                slot.is_reserved = False
-                slot.is_occupied = False
-        else:
-            pending_res = Reservation.objects.filter(
-                parking_slot=slot,
-                status='PENDING',
-                end_time__gte=now
-            ).order_by('start_time').first()
-            if pending_res:
-                slot.is_reserved = False
-                slot.is_occupied = False
-            else:
-                slot.is_reserved = False
-                slot.is_occupied = False
-        slot.save()
+        instance.status = validated_data.get('status', instance.status)
+        with transaction.atomic():
+            instance.save(update_fields=['status', 'updated_at'])
+            ParkingSlot.objects.filter(pk=instance.parking_slot_id).refresh_reservation_flags()
         return instance 
\ No newline at end of file
@@ -1,10 +1,14 @@
-from rest_framework import generics, permissions, status, filters, serializers
+from datetime import timedelta
+from rest_framework import generics, permissions, status, filters
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenObtainPairView
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.utils import timezone
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Count, Q
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema
 from .models import ParkingLocation, ParkingSlot, Reservation
@@ -14,26 +18,41 @@ from .serializers import (
     # Location serializers
     ParkingLocationSerializer, ParkingLocationCreateSerializer,
     # Slot serializers
-    ParkingSlotSerializer, ParkingSlotCreateSerializer,
+    ParkingSlotSerializer, ParkingSlotListSerializer, ParkingSlotCreateSerializer,
     # Reservation serializers
     ReservationSerializer, ReservationCreateSerializer, ReservationUpdateSerializer
 )
-from .pagination import CustomPagination
+from .pagination import CustomPagination, ReservationCursorPagination
 
 User = get_user_model()
 
+DASHBOARD_STATS_CACHE_KEY = 'dashboard:stats'
+
 # Custom permissions
+def is_admin_request(request):
+    """Return whether the requesting user is an admin, cached on the request."""
+    try:
+        return request._is_admin
+    except AttributeError:
+        request._is_admin = bool(getattr(request.user, 'is_admin', False))
+        return request._is_admin
+
 class IsAdminUser(permissions.BasePermission):
     """Allow only admin users to access the view."""
     
     def has_permission(self, request, view):
-        return request.user and request.user.is_admin
+        return is_admin_request(request)
 
 class IsOwnerOrAdmin(permissions.BasePermission):
     """Allow users to access their own data or admin to access any data."""
     
     def has_object_permission(self, request, view, obj):
-        return request.user.is_admin or obj.user == request.user
+        return is_admin_request(request) or obj.user_id == request.user.pk
+
+# permission classes hold no per-request state, so views can share instances
+ADMIN_ONLY = (IsAdminUser(),)
+AUTHENTICATED = (permissions.IsAuthenticated(),)
+PUBLIC = (permissions.AllowAny(),)
 
 # User Views
 @extend_schema(tags=['Authentication'])
@@ -97,7 +116,7 @@ class ChangePasswordView(generics.UpdateAPIView):
             )
 
         user.set_password(serializer.validated_data['new_password'])
-        user.save()
+        user.save(update_fields=['password', 'updated_at'])
         return Response(status=status.HTTP_200_OK)
 
 @extend_schema(tags=['Users'])
@@ -112,7 +131,11 @@ class UserListView(generics.ListAPIView, generics.DestroyAPIView):
     
     Also allows deletion of users (Admin only).
     """
-    queryset = User.objects.all()
+    # only the columns rendered by UserSerializer; skips the password hash etc.
+    queryset = User.objects.only(
+        'id', 'email', 'role', 'first_name', 'last_name',
+        'notification_preference', 'created_at'
+    )
     serializer_class = UserSerializer
     permission_classes = (IsAdminUser,)
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -170,6 +193,9 @@ class ParkingLocationListView(generics.ListCreateAPIView):
     filterset_fields = ['is_active']
     search_fields = ['name', 'address']
 
+    def get_queryset(self):
+        return ParkingLocation.objects.with_available_slots()
+
     def get_serializer_class(self):
         if self.request.method == 'POST':
             return ParkingLocationCreateSerializer
@@ -177,8 +203,8 @@ class ParkingLocationListView(generics.ListCreateAPIView):
 
     def get_permissions(self):
         if self.request.method == 'POST':
-            return [IsAdminUser()]
-        return [permissions.AllowAny()]
+            return ADMIN_ONLY
+        return PUBLIC
 
 @extend_schema(tags=['Locations'])
 class ParkingLocationDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -192,10 +218,13 @@ class ParkingLocationDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = ParkingLocation.objects.all()
     serializer_class = ParkingLocationSerializer
 
+    def get_queryset(self):
+        return ParkingLocation.objects.with_available_slots()
+
     def get_permissions(self):
         if self.request.method in ['PUT', 'PATCH', 'DELETE']:
-            return [IsAdminUser()]
-        return [permissions.IsAuthenticated()]
+            return ADMIN_ONLY
+        return AUTHENTICATED
 
 # Parking Slot Views
 @extend_schema(tags=['Slots'])
@@ -203,28 +232,39 @@ class ParkingSlotListView(generics.ListCreateAPIView):
     """
     List all parking slots or create a new one.
     
-    - GET: List all parking slots (public)
-    - POST: Create a new parking slot (admin only)
+    - GET: List all parking slots (public), read as plain values
+    - POST: Create a new parking slot, or a list of slots in bulk (admin only)
     
     Provides filtering and searching capabilities:
     - Filter by: location, is_occupied, is_reserved
     - Search in: slot_number
     """
     queryset = ParkingSlot.objects.all()
-    serializer_class = ParkingSlotSerializer
+    serializer_class = ParkingSlotListSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     filterset_fields = ['location', 'is_occupied', 'is_reserved']
     search_fields = ['slot_number']
 
+    def get_queryset(self):
+        return ParkingSlot.objects.order_by('id').values(
+            'id', 'slot_number', 'is_occupied', 'is_reserved',
+            'location_id', 'location__name'
+        )
+
     def get_serializer_class(self):
         if self.request.method == 'POST':
             return ParkingSlotCreateSerializer
-        return ParkingSlotSerializer
+        return ParkingSlotListSerializer
+
+    def get_serializer(self, *args, **kwargs):
+        if isinstance(kwargs.get('data'), list):
+            kwargs['many'] = True
+        return super().get_serializer(*args, **kwargs)
 
     def get_permissions(self):
         if self.request.method == 'POST':
-            return [IsAdminUser()]
-        return [permissions.AllowAny()]
+            return ADMIN_ONLY
+        return PUBLIC
 
 @extend_schema(tags=['Slots'])
 class ParkingSlotDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -239,6 +279,9 @@ class ParkingSlotDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = ParkingSlotSerializer
     permission_classes = (IsAdminUser,)
 
+    def get_queryset(self):
+        return ParkingSlot.objects.select_related('location').with_active_reservations()
+
 @extend_schema(tags=['Slots'])
 class LocationParkingSlotsView(generics.ListAPIView):
     """
@@ -252,7 +295,12 @@ class LocationParkingSlotsView(generics.ListAPIView):
 
     def get_queryset(self):
         location_id = self.kwargs.get('pk')
-        return ParkingSlot.objects.filter(location_id=location_id)
+        return ParkingSlot.objects.filter(
+            location_id=location_id
+        ).select_related('location').only(
+            'id', 'location', 'slot_number', 'is_occupied', 'is_reserved',
+            'created_at', 'updated_at', 'location__name'
+        ).with_active_reservations().order_by('id')
 
 # Reservation Views
 @extend_schema(tags=['Reservations'])
@@ -275,36 +323,29 @@ class ReservationListView(generics.ListCreateAPIView):
     filterset_fields = ['status', 'parking_slot__location']
     search_fields = ['parking_slot__slot_number']
     ordering_fields = ['start_time', 'end_time', 'created_at']
+    ordering = ['-created_at']
+    pagination_class = ReservationCursorPagination
 
     def get_queryset(self):
         user = self.request.user
-        if user.is_admin:
-            return Reservation.objects.all()
-        return Reservation.objects.filter(user=user)
+        queryset = Reservation.objects.with_can_be_cancelled().select_related(
+            'user', 'parking_slot__location'
+        ).only(
+            'id', 'start_time', 'end_time', 'vehicle_plate', 'status',
+            'created_at', 'updated_at', 'user__email',
+            'parking_slot__slot_number', 'parking_slot__location__name'
+        )
+        if is_admin_request(self.request):
+            return queryset
+        return queryset.filter(user=user)
 
     def get_serializer_class(self):
         if self.request.method == 'POST':
             return ReservationCreateSerializer
         return ReservationSerializer
 
-    def create(self, request, *args, **kwargs):
-        try:
-            serializer = self.get_serializer(data=request.data)
-            serializer.is_valid(raise_exception=True)
-            self.perform_create(serializer)
-            headers = self.get_success_headers(serializer.data)
-            return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
-        except Exception as e:
-            return Response(
-                {"detail": str(e)},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
     def perform_create(self, serializer):
-        try:
-            serializer.save(user=self.request.user)
-        except Exception as e:
-            raise serializers.ValidationError(str(e))
+        serializer.save(user=self.request.user)
 
 @extend_schema(tags=['Reservations'])
 class ReservationDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -321,13 +362,18 @@ class ReservationDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = ReservationSerializer
     permission_classes = (IsOwnerOrAdmin,)
 
+    def get_queryset(self):
+        return Reservation.objects.with_can_be_cancelled().select_related(
+            'user', 'parking_slot__location'
+        )
+
     def get_serializer_class(self):
         if self.request.method in ['PUT', 'PATCH']:
             return ReservationUpdateSerializer
         return ReservationSerializer
 
     def perform_update(self, serializer):
-        if self.request.user.is_admin:
+        if is_admin_request(self.request):
             serializer.save()
         else:
             # Regular users can only cancel their own reservations
@@ -346,22 +392,27 @@ class ReservationCancelView(generics.UpdateAPIView):
     - Reservation must be in PENDING status
     - Must be within the cancellation window (default: 1 hour before start time)
     """
-    queryset = Reservation.objects.all()
+    queryset = Reservation.objects.select_related('parking_slot')
     serializer_class = ReservationUpdateSerializer
     permission_classes = (IsOwnerOrAdmin,)
 
     def update(self, request, *args, **kwargs):
         instance = self.get_object()
-        if not instance.can_be_cancelled:
-            return Response(
-                {"detail": "This reservation cannot be cancelled."},
-                status=status.HTTP_400_BAD_REQUEST
+        with transaction.atomic():
+            # the cancellation rules are checked by the UPDATE itself, so a
+            # concurrent status change cannot slip in between check and write
+            cancelled = Reservation.objects.cancellable().filter(pk=instance.pk).update(
+                status=Reservation.Status.CANCELLED, updated_at=timezone.now()
             )
-        
-        serializer = self.get_serializer(instance, data={'status': 'CANCELLED'}, partial=True)
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
-        return Response(serializer.data)
+            if not cancelled:
+                return Response(
+                    {"detail": "This reservation cannot be cancelled."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            ParkingSlot.objects.filter(pk=instance.parking_slot_id).refresh_reservation_flags()
+
+        instance.status = Reservation.Status.CANCELLED
+        return Response(self.get_serializer(instance).data)
 
 # Dashboard Views (Admin only)
 @extend_schema(tags=['Dashboard'])
@@ -375,32 +426,41 @@ class DashboardStatsView(APIView):
     - total_slots: Total number of parking slots
     - occupied_slots: Number of currently occupied slots
     - available_slots: Number of currently available slots
+    
+    Results are cached for DASHBOARD_STATS_CACHE_SECONDS.
     """
     permission_classes = (IsAdminUser,)
 
     def get(self, request):
-        today = timezone.now().date()
-        
-        # Get total reservations for today
-        today_reservations = Reservation.objects.filter(
-            start_time__date=today
-        ).count()
+        today_start = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+        # keyed per day so a cached entry never reports yesterday's counts
+        stats = cache.get_or_set(
+            f'{DASHBOARD_STATS_CACHE_KEY}:{today_start.date().isoformat()}',
+            lambda: self.compute_stats(today_start),
+            settings.DASHBOARD_STATS_CACHE_SECONDS
+        )
+        return Response(stats)
+
+    def compute_stats(self, today_start):
+        # half-open range on start_time so the index can be used
+        tomorrow_start = today_start + timedelta(days=1)
         
-        # Get active reservations
-        active_reservations = Reservation.objects.filter(
-            status__in=['PENDING', 'CONFIRMED']
-        ).count()
+        # today's and active reservations in a single query
+        reservations = Reservation.objects.aggregate(
+            today=Count('id', filter=Q(start_time__gte=today_start, start_time__lt=tomorrow_start)),
+            active=Count('id', filter=Q(status__in=['PENDING', 'CONFIRMED']))
+        )
         
-        # Get total available slots
-        total_slots = ParkingSlot.objects.count()
-        occupied_slots = ParkingSlot.objects.filter(
-            is_occupied=True
-        ).count()
+        # total and occupied slots in a single query
+        slots = ParkingSlot.objects.aggregate(
+            total=Count('id'),
+            occupied=Count('id', filter=Q(is_occupied=True))
+        )
         
-        return Response({
-            'today_reservations': today_reservations,
-            'active_reservations': active_reservations,
-            'total_slots': total_slots,
-            'occupied_slots': occupied_slots,
-            'available_slots': total_slots - occupied_slots
-        }) 
\ No newline at end of file
+        return {
+            'today_reservations': reservations['today'],
+            'active_reservations': reservations['active'],
+            'total_slots': slots['total'],
+            'occupied_slots': slots['occupied'],
+            'available_slots': slots['total'] - slots['occupied']
+        }
\ No newline at end of file
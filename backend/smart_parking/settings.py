@@ -80,6 +80,10 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # reuse connections across requests instead of reconnecting each time;
+        # set to 0 when running behind an external pooler such as PgBouncer
+        "CONN_MAX_AGE": int(os.getenv('DB_CONN_MAX_AGE', '60')),
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
@@ -207,6 +211,9 @@ EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 RESERVATION_EXPIRY_MINUTES = 15  # time window for reservation confirmation
 RESERVATION_CANCELLATION_WINDOW_HOURS = 1  # time window for cancellation before start time
 
+# dashboard settings
+DASHBOARD_STATS_CACHE_SECONDS = 30  # how long admin dashboard statistics are cached
+
 # spectacular settings
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Smart Parking API',